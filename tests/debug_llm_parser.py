@@ -1,30 +1,292 @@
 import re
 import json
 import os
+import asyncio
+import hashlib
+import random
+import contextlib
+from contextvars import ContextVar
 from pathlib import Path
+import httpx
 from openai import AsyncOpenAI
 
-client = AsyncOpenAI(
-    api_key='sk-vTUtgFvIecBHF9XpZvg0OVFYYexMSZGayAmtFKjWvX5PFt10',
-    base_url='https://yeysai.com/v1'
-)
+# 优先使用 orjson 编解码 LLM 请求/响应, 未安装时回退到标准库 json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 缓存键优先使用 blake3 (SIMD + 多线程), 未安装时使用标准库 blake2b
+try:
+    from blake3 import blake3
+    BLAKE3_AVAILABLE = True
+except ImportError:
+    BLAKE3_AVAILABLE = False
+
+# HTTP/2 需要 h2 包 (pip install httpx[http2]), 未安装时使用 HTTP/1.1
+try:
+    import h2
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+def _make_client():
+    # 所有请求共享同一个连接池; 调大连接上限以支撑 step2/step3 的并发请求
+    http_client = httpx.AsyncClient(
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=200, max_keepalive_connections=200),
+        timeout=httpx.Timeout(600.0, connect=5.0)
+    )
+    return AsyncOpenAI(
+        api_key='sk-vTUtgFvIecBHF9XpZvg0OVFYYexMSZGayAmtFKjWvX5PFt10',
+        base_url='https://yeysai.com/v1',
+        max_retries=3,
+        http_client=http_client
+    )
+
+# 未通过 shared_openai_client 设置时使用的默认客户端
+client = _make_client()
+
+# 当前解析任务使用的客户端, 由 shared_openai_client 设置, 子任务自动继承
+_client_ctx = ContextVar('openai_client', default=None)
+
+@contextlib.asynccontextmanager
+async def shared_openai_client():
+    # 在当前事件循环内创建一个客户端供整个解析流程共享, 退出时关闭连接池;
+    # 嵌套调用时直接复用外层已设置的客户端
+    current = _client_ctx.get()
+    if current is not None:
+        yield current
+        return
+    shared = _make_client()
+    token = _client_ctx.set(shared)
+    try:
+        yield shared
+    finally:
+        _client_ctx.reset(token)
+        await shared.close()
+
+def _json_dumps(obj, indent=False, sort_keys=False):
+    if ORJSON_AVAILABLE:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option).decode('utf-8')
+    return json.dumps(obj, ensure_ascii=False, indent=2 if indent else None, sort_keys=sort_keys)
+
+def _digest(data):
+    if BLAKE3_AVAILABLE:
+        return blake3(data, max_threads=blake3.AUTO).hexdigest()
+    return hashlib.blake2b(data, digest_size=32).hexdigest()
+
+def _json_loads(text):
+    if ORJSON_AVAILABLE:
+        return orjson.loads(text)
+    return json.loads(text)
+
+def _parse_json_reply(content):
+    # 去掉 ``` 代码块包裹后解析 LLM 回复; 空回复或顶层不是对象时视为失败
+    if not content:
+        raise ValueError("empty LLM response")
+    if '```json' in content:
+        content = content.split('```json')[1].split('```')[0]
+    elif '```' in content:
+        content = content.split('```')[1].split('```')[0]
+    data = _json_loads(content)
+    if not isinstance(data, dict):
+        raise ValueError("LLM response is not a JSON object")
+    return data
+
+def _is_valid_regex(pattern):
+    try:
+        re.compile(pattern)
+        return True
+    except re.error:
+        return False
+
+# 各步骤对 LLM 回复的验收条件: 只有被调用方接受的回复才写入缓存, 否则下次运行会重新请求
+def _step1_reply_ok(data):
+    patterns = data.get('patterns')
+    return isinstance(patterns, list) and any(
+        isinstance(item, dict) and isinstance(item.get('regex'), str) and item['regex']
+        and _is_valid_regex(_NAMED_GROUP_RE.sub('(', item['regex']))
+        for item in patterns
+    )
+
+def _step2_reply_ok(data):
+    confirmed = data.get('confirmed_prompts')
+    return isinstance(confirmed, list) and all(
+        isinstance(n, int) and not isinstance(n, bool) for n in confirmed
+    )
+
+def _step4_reply_ok(data):
+    results = data.get('turns')
+    return isinstance(results, list) and all(isinstance(v, dict) for v in results)
+
+def _is_step_entry(obj, *keys):
+    # 校验缓存中的 step3/step4 结果结构, 损坏或旧格式的条目视为未命中
+    return (isinstance(obj, dict) and all(key in obj for key in keys)
+            and isinstance(obj['turns'], list))
+
+def _write_json(path, obj):
+    # orjson 在 C 层完成缩进, 输出保持可读; 标准库的缩进输出走纯 Python 编码器, 回退时改为紧凑格式
+    if ORJSON_AVAILABLE:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(obj, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS))
+    else:
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(json.dumps(obj, ensure_ascii=False, separators=(',', ':')))
+
+def _system_message(content, model):
+    # 系统提示词固定放在首条消息且逐字节不变, 服务端可复用前缀缓存;
+    # Claude 模型不会自动缓存, 需在内容块上显式标记缓存断点
+    content = content.strip()
+    if model.startswith('claude'):
+        return {"role": "system", "content": [
+            {"type": "text", "text": content, "cache_control": {"type": "ephemeral"}}
+        ]}
+    return {"role": "system", "content": content}
+
+# 去掉 LLM 生成的命名分组 (?<name>...), 只保留普通分组
+_NAMED_GROUP_RE = re.compile(r'\(\?<[^>]+>')
+
+# LLM 响应缓存的默认目录
+DEFAULT_CACHE_DIR = '~/.cache/openterminal'
+# step3/step4 结果缓存的版本号, 修改这两步的提示词或解析逻辑后需递增以使旧缓存失效
+STEP_CACHE_VERSION = 1
+
+# step1 对长文件采样的行数: 头部 / 尾部 / 中间随机
+STEP1_SAMPLE_HEAD = 300
+STEP1_SAMPLE_TAIL = 300
+STEP1_SAMPLE_MIDDLE = 200
+
+# step4 发送给校验模型的原始文本最大字符数, 超出时保留头尾各一半
+STEP4_MAX_RAW_CHARS = 200_000
 
 class TerminalParser:    
-    def __init__(self, model_name='qwen3-8b', step4_model_name='claude-sonnet-4-20250514'):
+    def __init__(self, model_name='qwen3-8b', step4_model_name='claude-sonnet-4-20250514', classify_batch_size=16, classify_batch_max_chars=24000, filter_chunk_size=40, max_concurrency=20, cache_dir=DEFAULT_CACHE_DIR):
         self.prompt_patterns = []
+        self._compiled_patterns = []
+        self._combined_pattern = None
+        # 行号 -> prompt 匹配结束位置, 由 step2 记录, step3 直接复用
+        self._prompt_match_ends = {}
+        # 最近一次 step3/step4 是否因 LLM 请求失败或回复不完整而回退, 回退的结果不写入缓存
+        self._step3_fell_back = False
+        self._step4_fell_back = False
         self.model_name = model_name
         self.step4_model_name = step4_model_name
+        # step2 每次 LLM 请求校验的候选 prompt 数
+        self.filter_chunk_size = filter_chunk_size
+        # step3 每次 LLM 请求最多分类的 turn 数及原始文本字符数
+        self.classify_batch_size = classify_batch_size
+        self.classify_batch_max_chars = classify_batch_max_chars
+        # 同时进行的 LLM 请求上限, 避免一次性发出大量请求触发限流 (429)
+        self.max_concurrency = max_concurrency
+        self._llm_semaphore = None
+        # 已加载文件的缓存: 路径 -> (行列表, 原始文本)
+        self._cached_path = None
+        self._lines = None
+        self._raw = None
+        # LLM 响应缓存目录, 为 None 时不缓存
+        self.cache_dir = Path(cache_dir).expanduser() if cache_dir else None
+
+    def _cache_key(self, *parts):
+        return _digest(_json_dumps(parts, sort_keys=True).encode('utf-8'))
+
+    def _cache_get(self, key):
+        if self.cache_dir is None:
+            return None
+        cache_file = self.cache_dir / f"{key}.json"
+        if not cache_file.exists():
+            return None
+        try:
+            return _json_loads(cache_file.read_bytes())
+        except (OSError, ValueError):
+            return None
 
-    async def step1_learn_prompts(self, file_path):
+    def _cache_put(self, key, value):
+        if self.cache_dir is None:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cache_file = self.cache_dir / f"{key}.json"
+            tmp_file = cache_file.with_suffix(f'.{os.getpid()}.tmp')
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                f.write(_json_dumps(value))
+            os.replace(tmp_file, cache_file)
+        except OSError:
+            pass
+
+    async def _cached_chat(self, messages, model, temperature=None, accept=None):
+        # 请求 LLM 并返回解析后的 JSON 对象; 解析失败时抛出异常且不写入缓存, 下次运行会重新请求.
+        # 以 (model, messages, temperature) 的哈希为键缓存响应内容, 重复解析同一文件时无需再请求 LLM.
+        # accept(data) 为调用方的验收条件: 不满足时回复照常返回, 但不写入缓存, 命中的缓存也视为未命中
+        key = self._cache_key(model, messages, temperature)
+        cached = self._cache_get(key)
+        if isinstance(cached, dict) and 'content' in cached:
+            try:
+                data = _parse_json_reply(cached['content'])
+                if accept is None or accept(data):
+                    return data
+            except ValueError:
+                pass
+
+        kwargs = {}
+        if temperature is not None:
+            kwargs['temperature'] = temperature
+        # 在事件循环内首次使用时创建信号量
+        if self._llm_semaphore is None:
+            self._llm_semaphore = asyncio.Semaphore(self.max_concurrency)
+        async with self._llm_semaphore:
+            response = await (_client_ctx.get() or client).chat.completions.create(
+                messages=messages,
+                model=model,
+                **kwargs
+            )
+        content = response.choices[0].message.content
+        data = _parse_json_reply(content)
+        if accept is None or accept(data):
+            self._cache_put(key, {'model': model, 'content': content})
+
+        return data
+
+    def _load(self, path):
+        # 每个文件只读取一次, 各步骤共享同一份行列表和原始文本
+        if self._cached_path != path:
+            text = Path(path).read_text(encoding='utf-8', errors='ignore')
+            self._lines = text.splitlines()
+            self._raw = text
+            self._cached_path = path
+        return self._lines, self._raw
+
+    def _sample_lines(self, lines):
+        # 长文件只取头尾各 300 行加中间随机 200 行, 足以覆盖各类 prompt, 又能大幅减少 step1 的输入 token
+        head, tail, middle = STEP1_SAMPLE_HEAD, STEP1_SAMPLE_TAIL, STEP1_SAMPLE_MIDDLE
+        if len(lines) <= head + tail + middle:
+            return lines
+
+        # 固定随机种子, 同一文件每次采样结果一致
+        rng = random.Random(len(lines))
+        picked = sorted(rng.sample(range(head, len(lines) - tail), middle))
+        print(f"Sampling {head + middle + tail} of {len(lines)} lines for prompt learning")
+        return (
+            lines[:head]
+            + ["... [elided] ..."]
+            + [lines[i] for i in picked]
+            + ["... [elided] ..."]
+            + lines[-tail:]
+        )
+
+    async def step1_learn_prompts(self, lines):
         print(f"\n{'='*60}")
-        print(f"[Step 1] Learning prompt patterns from: {file_path}")
+        print(f"[Step 1] Learning prompt patterns")
         print(f"{'='*60}")
 
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = [line.rstrip('\n') for line in f.readlines()]
-
         print(f"Total lines in file: {len(lines)}")
-        sample_text = '\n'.join(lines)
+        sample_text = '\n'.join(self._sample_lines(lines))
         
         system_prompt = """You are an expert in Terminal Prompt Recognition.
 
@@ -89,9 +351,9 @@ Example Output:
 Note: Ensure the regex uses double backslashes for escaping (e.g., \\s*) to remain valid within the JSON string."""
         
         try:
-            response = await client.chat.completions.create(
+            data = await self._cached_chat(
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    _system_message(system_prompt, self.model_name),
                     {"role": "user", "content": f"""Analyze the following terminal output and identify ALL distinct prompt patterns.
 
 Important Notes:
@@ -104,33 +366,25 @@ Terminal Output:
 
 Please return generic regex patterns for all prompt types."""}
                 ],
-                model=self.model_name
+                model=self.model_name,
+                accept=_step1_reply_ok
             )
-            
-            result = response.choices[0].message.content
-            
-            if '```json' in result:
-                result = result.split('```json')[1].split('```')[0]
-            elif '```' in result:
-                result = result.split('```')[1].split('```')[0]
-            
-            data = json.loads(result)
 
             print(f"\n[Step 1] LLM identified {len(data.get('patterns', []))} prompt patterns:")
 
             for item in data.get('patterns', []):
                 pattern = item.get('regex', '')
                 if pattern:
-                    cleaned = re.sub(r'\(\?<[^>]+>', '(', pattern)
+                    cleaned = _NAMED_GROUP_RE.sub('(', pattern)
 
-                    try:
-                        re.compile(cleaned)
+                    if _is_valid_regex(cleaned):
                         self.prompt_patterns.append(cleaned)
                         print(f"  ✓ Pattern: {cleaned[:80]}")
                         print(f"    Example: {item.get('example', 'N/A')[:80]}")
-                    except re.error:
+                    else:
                         print(f"  ✗ Invalid pattern (skipped): {cleaned[:80]}")
-                        pass
+
+            self._compile_patterns()
 
             print(f"\n[Step 1] Result: {len(self.prompt_patterns)} valid patterns learned")
             return len(self.prompt_patterns) > 0
@@ -139,48 +393,47 @@ Please return generic regex patterns for all prompt types."""}
             print(f"\n[Step 1] Error: {str(e)}")
             return False
     
-    async def step2_filter_fake_prompts(self, file_path):
+    def _compile_patterns(self):
+        # 每个 pattern 只编译一次; 再合并成一个交替正则, 一次 match 即可判断是否为 prompt
+        self._compiled_patterns = []
+        for pattern in self.prompt_patterns:
+            try:
+                self._compiled_patterns.append(re.compile(pattern))
+            except re.error:
+                continue
+
+        # 含反向引用 (合并后分组编号会变) 或内联标志的 pattern 无法合并, 回退到逐个匹配
+        self._combined_pattern = None
+        if self._compiled_patterns and not any(re.search(r'\\[1-9]|\(\?P=', p.pattern) for p in self._compiled_patterns):
+            try:
+                self._combined_pattern = re.compile('|'.join(f'(?:{p.pattern})' for p in self._compiled_patterns))
+            except re.error:
+                pass
+
+    def _match_prompt(self, line):
+        # 交替正则按顺序尝试各分支, 结果与逐个 pattern 依次 match 的第一个命中一致
+        if self._combined_pattern is not None:
+            return self._combined_pattern.match(line)
+        for compiled in self._compiled_patterns:
+            match = compiled.match(line)
+            if match:
+                return match
+        return None
+
+    async def step2_filter_fake_prompts(self, lines):
         print(f"\n{'='*60}")
         print(f"[Step 2] Filtering fake prompts")
         print(f"{'='*60}")
 
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-        
         candidate_prompts = []
-        matched_line_nums = set()
+        self._prompt_match_ends = {}
         
         for line_num, line in enumerate(lines, 1):
-            if line_num in matched_line_nums:
-                continue
-                
-            line_content = line.rstrip('\n')
-            
-            matched = False
-            matched_pattern = None
-            matched_lines = 1
-            
-            for pattern in self.prompt_patterns:
-                try:
-                    if re.match(pattern, line_content):
-                        matched = True
-                        matched_pattern = pattern
-                        matched_lines = 1
-                        break
-                except re.error:
-                    continue
-            
-            if matched:
-                matched_line_nums.add(line_num)
-                
-                candidate_prompts.append({
-                    'line_num': line_num,
-                    'content': line_content,
-                    'prev_line': lines[line_num-2].rstrip('\n') if line_num > 1 else '',
-                    'next_line': lines[line_num].rstrip('\n') if line_num < len(lines) else '',
-                    'is_multiline': False,
-                    'num_lines': 1
-                })
+            match = self._match_prompt(line)
+            if match:
+                self._prompt_match_ends[line_num] = match.end()
+                # (行号, 截断后的内容); 上下文行在构造 LLM 请求时再按行号取
+                candidate_prompts.append((line_num, line[:100]))
 
         if not candidate_prompts:
             print(f"\n[Step 2] No candidate prompts found by regex matching")
@@ -189,14 +442,21 @@ Please return generic regex patterns for all prompt types."""}
         print(f"\n[Step 2] Found {len(candidate_prompts)} candidate prompts by regex")
         print(f"[Step 2] Sending to LLM for verification...")
 
-        confirmed_line_nums = await self._filter_with_llm(candidate_prompts)
+        confirmed_line_nums = await self._filter_with_llm(candidate_prompts, lines)
 
         print(f"\n[Step 2] Result: {len(confirmed_line_nums)} confirmed real prompts")
         print(f"[Step 2] Confirmed line numbers: {sorted(list(confirmed_line_nums))[:10]}{'...' if len(confirmed_line_nums) > 10 else ''}")
 
         return confirmed_line_nums
     
-    async def _filter_with_llm(self, candidates):
+    async def _filter_with_llm(self, candidates, lines):
+        # 候选行分块并发发送, 重叠各请求的网络往返
+        size = self.filter_chunk_size
+        chunks = [candidates[i:i + size] for i in range(0, len(candidates), size)]
+        results = await asyncio.gather(*[self._filter_chunk(chunk, lines) for chunk in chunks])
+        return set().union(*results)
+
+    async def _filter_chunk(self, candidates, lines):
         system_prompt = """You are an expert in Terminal Prompt Verification. Determine which lines are real prompts and which are just text that happens to match the regex pattern.
 
 Real Prompt Characteristics:
@@ -221,118 +481,90 @@ Return JSON format:
 Note: If uncertain, lean towards considering it a real prompt (conservative strategy)."""
         
         candidates_text = []
-        for c in candidates:
+        for line_num, content in candidates:
+            prev_line = lines[line_num-2][:100] if line_num > 1 else ''
+            next_line = lines[line_num][:100] if line_num < len(lines) else ''
             candidates_text.append(f"""
-Line {c['line_num']}:
-  Previous: {c['prev_line'][:100] if c['prev_line'] else '(start of file)'}
-  [Current]: {c['content'][:100]}
-  Next: {c['next_line'][:100] if c['next_line'] else '(end of file)'}
+Line {line_num}:
+  Previous: {prev_line if prev_line else '(start of file)'}
+  [Current]: {content}
+  Next: {next_line if next_line else '(end of file)'}
 """)
         
         try:
-            response = await client.chat.completions.create(
+            data = await self._cached_chat(
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    _system_message(system_prompt, self.model_name),
                     {"role": "user", "content": f"Determine which of the following candidate lines are real prompts:{''.join(candidates_text)}\n\nPlease analyze line by line and provide a list of confirmed real prompt line numbers."}
                 ],
                 model=self.model_name,
-                temperature=0.3
+                temperature=0.3,
+                accept=_step2_reply_ok
             )
             
-            result = response.choices[0].message.content
-            
-            if '```json' in result:
-                result = result.split('```json')[1].split('```')[0]
-            elif '```' in result:
-                result = result.split('```')[1].split('```')[0]
-            
-            data = json.loads(result)
-            
             confirmed = set(data.get('confirmed_prompts', []))
             
             return confirmed
         
         except Exception:
-            return set(c['line_num'] for c in candidates)
+            return set(line_num for line_num, _ in candidates)
     
-    async def step3_parse_turns(self, file_path, confirmed_line_nums):
+    async def step3_parse_turns(self, lines, confirmed_line_nums):
         print(f"\n{'='*60}")
         print(f"[Step 3] Parsing turns from confirmed prompts")
         print(f"{'='*60}")
 
-        with open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
-        
         result = {
             "initial_output": "",
             "turns": []
         }
         
-        current_turn = None
+        # 每个 turn 的原始行单独存放在与 turns 平行的列表中, 输出的 turn 不携带内部字段
+        raw_lines_per_turn = []
+        current_raw_lines = None
         turn_id = 0
         initial_lines = []
-        in_initial = True
         
         for line_num, line in enumerate(lines, 1):
-            line = line.rstrip('\n')
-            
-            is_prompt = False
-            matched_pattern = None
-            
+            match_end = None
             if line_num in confirmed_line_nums:
-                for pattern in self.prompt_patterns:
-                    try:
-                        match = re.match(pattern, line)
-                        if match:
-                            is_prompt = True
-                            matched_pattern = (pattern, match, 1)
-                            break
-                    except re.error:
-                        continue
+                match_end = self._prompt_match_ends.get(line_num)
+                if match_end is None:
+                    match = self._match_prompt(line)
+                    match_end = match.end() if match else None
             
-            if is_prompt:
-                if current_turn is not None:
-                    result["turns"].append(current_turn)
-                
-                in_initial = False
+            if match_end is not None:
                 turn_id += 1
                 
-                pattern_str, match, _ = matched_pattern
-                
-                prompt_str = line[:match.end()]
+                prompt_str = line[:match_end]
                 
-                current_turn = {
+                result["turns"].append({
                     "turn_id": turn_id,
                     "prompt": prompt_str,
-                    "raw_lines": [line],
                     "action": {
                         "content": ""
                     },
                     "observation": {
                         "content": ""
                     },
-                }
+                })
+                current_raw_lines = [line]
+                raw_lines_per_turn.append(current_raw_lines)
+            elif current_raw_lines is None:
+                initial_lines.append(line)
             else:
-                if in_initial:
-                    initial_lines.append(line)
-                elif current_turn is not None:
-                    current_turn["raw_lines"].append(line)
-                            
-        if current_turn is not None:
-            result["turns"].append(current_turn)
+                current_raw_lines.append(line)
         
         result["initial_output"] = '\n'.join(initial_lines)
 
         print(f"\n[Step 3] Parsed {len(result['turns'])} turns")
         print(f"[Step 3] Initial output: {len(initial_lines)} lines")
 
+        self._step3_fell_back = False
         if result['turns']:
             print(f"[Step 3] Classifying actions and observations with LLM...")
-            import asyncio
-            tasks = []
-            for turn in result['turns']:
-                tasks.append(self._llm_classify_action_observation(turn))
-            await asyncio.gather(*tasks)
+            fallback_count = await self._llm_classify_action_observation_batch(result['turns'], raw_lines_per_turn)
+            self._step3_fell_back = fallback_count > 0
 
             print(f"[Step 3] Turn classification completed")
             for i, turn in enumerate(result['turns'][:3], 1):
@@ -340,17 +572,51 @@ Line {c['line_num']}:
             if len(result['turns']) > 3:
                 print(f"  ... and {len(result['turns']) - 3} more turns")
 
-        # 删除仅用于内部处理的 raw_lines 字段
-        for turn in result['turns']:
-            if 'raw_lines' in turn:
-                del turn['raw_lines']
-
         return result
 
-    async def _llm_classify_action_observation(self, turn):
+    def _chunk_turns_for_classification(self, items):
+        # items 为 (turn, raw_lines); 按条数和原始文本长度 (近似 token 数) 切分批次
+        chunks = []
+        current = []
+        current_chars = 0
+        for item in items:
+            turn_chars = sum(len(line) for line in item[1])
+            if current and (len(current) >= self.classify_batch_size or current_chars + turn_chars > self.classify_batch_max_chars):
+                chunks.append(current)
+                current = []
+                current_chars = 0
+            current.append(item)
+            current_chars += turn_chars
+        if current:
+            chunks.append(current)
+        return chunks
+
+    async def _llm_classify_action_observation_batch(self, turns, raw_lines_per_turn):
+        # 原始行完全相同的 turn (如反复执行的 ls/pwd) 只分类一次, 结果复制给其余相同的 turn
+        groups = {}
+        for turn, raw_lines in zip(turns, raw_lines_per_turn):
+            key = hashlib.blake2b(
+                (turn['prompt'] + '\0' + '\n'.join(raw_lines)).encode('utf-8'),
+                digest_size=16
+            ).digest()
+            groups.setdefault(key, []).append((turn, raw_lines))
+
+        unique_items = [group[0] for group in groups.values()]
+        chunks = self._chunk_turns_for_classification(unique_items)
+        fallback_counts = await asyncio.gather(*[self._classify_batch(chunk) for chunk in chunks])
+
+        for (first, _), *duplicates in groups.values():
+            for turn, _ in duplicates:
+                turn['prompt'] = first['prompt']
+                turn['action']['content'] = first['action']['content']
+                turn['observation']['content'] = first['observation']['content']
+
+        return sum(fallback_counts)
+
+    async def _classify_batch(self, items):
         system_prompt = """You are an expert in Terminal Command/Output Classification.
 
-Given the raw lines of a terminal turn, classify which part is the prompt, which part is the user's command (action), and which part is the command's output (observation).
+You will receive a JSON array of terminal turns. For EACH turn, given its raw lines, classify which part is the prompt, which part is the user's command (action), and which part is the command's output (observation).
 
 Key Principles:
 1. The prompt may be single-line or multi-line (e.g., two-line prompts like "user@host|~/path\\n> ")
@@ -359,6 +625,7 @@ Key Principles:
 4. Command parameters/arguments that span multiple lines are part of the action
 5. Everything after the complete command is the observation (output)
 6. The prompt itself is NOT part of the action content
+7. Classify every turn independently and return exactly one result per input turn_id
 
 Common Patterns:
 - Single-line prompt: "user@host:~$ command" - prompt is "user@host:~$"
@@ -367,122 +634,160 @@ Common Patterns:
 - Here-doc (<<EOF): Everything until EOF is part of the command input
 - Interactive commands: May have interleaved input/output
 
-Return JSON format:
-{
-  "prompt": "The complete prompt (may be multi-line, use \\n for line breaks)",
-  "action_lines": ["line1 of command", "line2 of command", ...],
-  "observation_lines": ["line1 of output", "line2 of output", ...]
-}
-
-Example 1 - Single line prompt:
-Raw lines:
-  user@host:~$ ls -la
-  total 8
-  drwxr-xr-x 2 user user 4096 Jan 1 00:00 .
-
-Result:
-{
-  "prompt": "user@host:~$ ",
-  "action_lines": ["ls -la"],
-  "observation_lines": ["total 8", "drwxr-xr-x 2 user user 4096 Jan 1 00:00 ."]
-}
+Input format:
+[
+  {"turn_id": 1, "raw_lines": ["line1", "line2", ...], "initial_prompt": "Initial prompt detected by regex"},
+  ...
+]
 
-Example 2 - Multi-line prompt:
-Raw lines:
-  user@host|~/documents
-  > ls -la
-  total 8
-  drwxr-xr-x 2 user user 4096 Jan 1 00:00 .
-
-Result:
+Return JSON format:
 {
-  "prompt": "user@host|~/documents\\n> ",
-  "action_lines": ["ls -la"],
-  "observation_lines": ["total 8", "drwxr-xr-x 2 user user 4096 Jan 1 00:00 ."]
+  "results": [
+    {
+      "turn_id": 1,
+      "prompt": "The complete prompt (may be multi-line, use \\n for line breaks)",
+      "action_lines": ["line1 of command", "line2 of command", ...],
+      "observation_lines": ["line1 of output", "line2 of output", ...]
+    },
+    ...
+  ]
 }
 
-Example 3 - Multi-line command:
-Raw lines:
-  $ docker run \\
-    --name test \\
-    -p 8080:80 \\
-    nginx
-  Unable to find image 'nginx:latest' locally。
+Example:
+Input:
+[
+  {"turn_id": 1, "raw_lines": ["user@host:~$ ls -la", "total 8", "drwxr-xr-x 2 user user 4096 Jan 1 00:00 ."], "initial_prompt": "user@host:~$ "},
+  {"turn_id": 2, "raw_lines": ["user@host|~/documents", "> ls -la", "total 8"], "initial_prompt": "user@host|~/documents"},
+  {"turn_id": 3, "raw_lines": ["$ docker run \\\\", "  --name test \\\\", "  nginx", "Unable to find image 'nginx:latest' locally"], "initial_prompt": "$ "}
+]
 
 Result:
 {
-  "prompt": "$ ",
-  "action_lines": ["docker run \\", "--name test \\", "-p 8080:80 \\", "nginx"],
-  "observation_lines": ["Unable to find image 'nginx:latest' locally"]
+  "results": [
+    {
+      "turn_id": 1,
+      "prompt": "user@host:~$ ",
+      "action_lines": ["ls -la"],
+      "observation_lines": ["total 8", "drwxr-xr-x 2 user user 4096 Jan 1 00:00 ."]
+    },
+    {
+      "turn_id": 2,
+      "prompt": "user@host|~/documents\\n> ",
+      "action_lines": ["ls -la"],
+      "observation_lines": ["total 8"]
+    },
+    {
+      "turn_id": 3,
+      "prompt": "$ ",
+      "action_lines": ["docker run \\\\", "--name test \\\\", "nginx"],
+      "observation_lines": ["Unable to find image 'nginx:latest' locally"]
+    }
+  ]
 }"""
 
-        raw_lines_text = '\n'.join([
-            f"  {i+1}. {line}"
-            for i, line in enumerate(turn['raw_lines'])
-        ])
-
-        user_message = f"""Classify the prompt, action (command), and observation (output) from these raw lines:
-
-[Raw Lines] ({len(turn['raw_lines'])} line(s))
-{raw_lines_text}
+        payload = [
+            {
+                "turn_id": turn['turn_id'],
+                "raw_lines": raw_lines,
+                "initial_prompt": turn['prompt']
+            }
+            for turn, raw_lines in items
+        ]
 
-[Initial prompt detected by regex]: {turn['prompt']}
+        user_message = f"""Classify the prompt, action (command), and observation (output) for each of the following {len(items)} turn(s):
+{_json_dumps(payload, indent=True)}
 
-Please extract the complete prompt (including all prompt lines if multi-line), the action lines (command without prompt) as a list, and observation lines (output) as a list."""
+For every turn_id, extract the complete prompt (including all prompt lines if multi-line), the action lines (command without prompt) as a list, and observation lines (output) as a list."""
 
+        fields_by_id = {}
         try:
-            response = await client.chat.completions.create(
+            # 只有覆盖本批全部 turn 的回复才写入缓存, 缺项或格式错误的回复下次运行重新请求
+            data = await self._cached_chat(
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    _system_message(system_prompt, self.model_name),
                     {"role": "user", "content": user_message}
                 ],
                 model=self.model_name,
-                temperature=0.2
+                temperature=0.2,
+                accept=lambda data: len(self._parse_classifications(items, data)) == len(items)
             )
+            fields_by_id = self._parse_classifications(items, data)
 
-            result = response.choices[0].message.content
-
-            if '```json' in result:
-                result = result.split('```json')[1].split('```')[0]
-            elif '```' in result:
-                result = result.split('```')[1].split('```')[0]
-
-            data = json.loads(result)
-
-            extracted_prompt = data.get('prompt', '').strip()
-            if extracted_prompt:
-                turn['prompt'] = extracted_prompt
+        except Exception as e:
+            print(f"[Step 3] Classification request failed: {str(e)}")
 
-            action_lines = data.get('action_lines', [])
-            if isinstance(action_lines, list):
-                turn['action']['content'] = '\n'.join(action_lines)
+        fallback_count = 0
+        for turn, raw_lines in items:
+            fields = fields_by_id.get(turn['turn_id'])
+            if fields is not None:
+                self._apply_classification(turn, fields)
             else:
-                turn['action']['content'] = str(action_lines).strip()
-
-            obs_lines = data.get('observation_lines', [])
-            if isinstance(obs_lines, list):
-                turn['observation']['content'] = '\n'.join([line for line in obs_lines if line.strip()])
+                self._fallback_classification(turn, raw_lines)
+                fallback_count += 1
+
+        if fallback_count:
+            print(f"[Step 3] Warning: {fallback_count}/{len(items)} turn(s) fell back to heuristic classification")
+        return fallback_count
+
+    def _parse_classifications(self, items, data):
+        # 返回 {turn_id: (prompt, action, observation)}, 只包含本批请求中且格式正确的条目
+        wanted = {turn['turn_id'] for turn, _ in items}
+        fields_by_id = {}
+        for r in data.get('results', []):
+            if not isinstance(r, dict):
+                continue
+            try:
+                # 小模型常把 turn_id 回显为字符串 ("3"), 统一转成 int 再匹配
+                turn_id = int(r.get('turn_id'))
+                if turn_id in wanted:
+                    fields_by_id[turn_id] = self._classification_fields(r)
+            except Exception:
+                continue
+        return fields_by_id
+
+    def _classification_fields(self, data):
+        extracted_prompt = data.get('prompt', '').strip()
+
+        action_lines = data.get('action_lines', [])
+        if isinstance(action_lines, list):
+            action = '\n'.join(action_lines)
+        else:
+            action = str(action_lines).strip()
+
+        obs_lines = data.get('observation_lines', [])
+        if isinstance(obs_lines, list):
+            observation = '\n'.join([line for line in obs_lines if line.strip()])
+        else:
+            observation = str(obs_lines).strip()
+
+        return extracted_prompt, action, observation
+
+    def _apply_classification(self, turn, fields):
+        extracted_prompt, action, observation = fields
+        if extracted_prompt:
+            turn['prompt'] = extracted_prompt
+        turn['action']['content'] = action
+        turn['observation']['content'] = observation
+
+    def _fallback_classification(self, turn, raw_lines):
+        if raw_lines:
+            first_line = raw_lines[0]
+            prompt = turn['prompt']
+            if first_line.startswith(prompt):
+                turn['action']['content'] = first_line[len(prompt):].strip()
             else:
-                turn['observation']['content'] = str(obs_lines).strip()
-
-        except Exception:
-            if turn['raw_lines']:
-                first_line = turn['raw_lines'][0]
-                prompt = turn['prompt']
-                if first_line.startswith(prompt):
-                    turn['action']['content'] = first_line[len(prompt):].strip()
-                else:
-                    turn['action']['content'] = first_line.strip()
+                turn['action']['content'] = first_line.strip()
 
-                turn['observation']['content'] = '\n'.join([
-                    line for line in turn['raw_lines'][1:] if line.strip()
-                ])
+            turn['observation']['content'] = '\n'.join([
+                line for line in raw_lines[1:] if line.strip()
+            ])
     
-    async def step4_verify_turns(self, input_file, parsed_result):
+    async def step4_verify_turns(self, raw_text, parsed_result):
         print(f"\n{'='*60}")
         print(f"[Step 4] Verifying turns with LLM")
         print(f"{'='*60}")
 
+        self._step4_fell_back = False
         turns = parsed_result.get('turns', [])
         if not turns:
             print(f"[Step 4] No turns to verify")
@@ -490,9 +795,6 @@ Please extract the complete prompt (including all prompt lines if multi-line), t
 
         print(f"[Step 4] Verifying {len(turns)} turns...")
 
-        with open(input_file, 'r', encoding='utf-8', errors='ignore') as f:
-            raw_text = f.read()
-
         initial_output = parsed_result.get('initial_output', '')
 
         system_prompt = """You are an expert in Terminal Turn Verification.
@@ -566,48 +868,52 @@ Rules:
 - The "prompt" field can be an empty string "" if there is no command-line prompt before the command (e.g., in scripts or automated environments). Always check for this case when splitting turns or extracting missed turns from initial_output"""
   
 
-        user_message = json.dumps({
+        # 超长文本只保留头尾, 校验模型的上下文有限, 也避免编码整份大文件
+        if len(raw_text) > STEP4_MAX_RAW_CHARS:
+            half = STEP4_MAX_RAW_CHARS // 2
+            raw_text = raw_text[:half] + "\n...[TRUNCATED]...\n" + raw_text[-half:]
+            print(f"[Step 4] Raw text truncated to head/tail {half} chars each")
+
+        user_message = _json_dumps({
             "raw_txt": raw_text,
             "parsed_json": {
                 "initial_output": initial_output,
                 "total_turns": len(turns),
                 "turns": turns
             }
-        }, ensure_ascii=False)
+        })
 
         missed_count = 0
+        # step3 产出的 turn_id 已是连续编号, 只需从最早发生插入的位置开始重新编号
+        first_changed_idx = len(turns)
 
         try:
-            response = await client.chat.completions.create(
+            data = await self._cached_chat(
                 messages=[
-                    {"role": "system", "content": system_prompt},
+                    _system_message(system_prompt, self.step4_model_name),
                     {"role": "user", "content": user_message}
                 ],
                 model=self.step4_model_name,
-                temperature=0.2
+                temperature=0.2,
+                accept=_step4_reply_ok
             )
-
-            result = response.choices[0].message.content
-
-            if '```json' in result:
-                result = result.split('```json')[1].split('```')[0]
-            elif '```' in result:
-                result = result.split('```')[1].split('```')[0]
-
-            data = json.loads(result)
+            # 回复缺少逐 turn 的校验结果时同样不写入 step4 结果缓存
+            if not _step4_reply_ok(data):
+                self._step4_fell_back = True
 
             missed_turns = data.get('missed_turns_in_initial_output', [])
             missed_count = len(missed_turns)
             if missed_turns:
                 print(f"[Step 4] ✓ Found {len(missed_turns)} missed turns in initial_output")
+                first_changed_idx = 0
 
                 corrected_initial = data.get('corrected_initial_output', '')
                 if corrected_initial:
                     parsed_result['initial_output'] = corrected_initial
                     print(f"[Step 4] ✓ Initial output corrected (removed command executions)")
 
-                for mt in reversed(missed_turns):
-                    new_turn = {
+                prefix = [
+                    {
                         "turn_id": 0,  # Placeholder, will be renumbered at the end
                         "prompt": mt.get('prompt', ''),
                         "action": {
@@ -617,7 +923,9 @@ Rules:
                             "content": mt.get('observation', {}).get('content', '')
                         }
                     }
-                    turns.insert(0, new_turn)
+                    for mt in missed_turns
+                ]
+                turns[:] = prefix + turns
             else:
                 if not data.get('initial_output_correct', True):
                     corrected_initial = data.get('corrected_initial_output', '')
@@ -631,6 +939,7 @@ Rules:
 
         except Exception as e:
             print(f"[Step 4] Error during verification: {str(e)}")
+            self._step4_fell_back = True
             verification_results = [
                 {
                     'turn_id': t.get('turn_id'),
@@ -640,34 +949,47 @@ Rules:
                 } for t in turns
             ]
 
-        turns_to_insert = []
-
         verification_map = {v.get('turn_id'): v for v in verification_results}
 
         correct_count = 0
         split_count = 0
         corrected_count = 0
 
-        for i in range(len(turns)):
-            v = verification_map.get(turns[i].get('turn_id'))
+        # 倒序遍历: 拆分时直接替换当前位置, 不影响尚未处理的前面各 turn 的下标
+        for i in range(len(turns) - 1, -1, -1):
+            turn = turns[i]
+            v = verification_map.get(turn.get('turn_id'))
             if not v:
                 continue
 
             if v.get('should_split', False):
                 split_turns = v.get('split_into_turns', [])
                 if len(split_turns) >= 2:
-                    turns_to_insert.append((i, split_turns))
+                    turns[i:i+1] = [
+                        {
+                            "turn_id": 0,
+                            "prompt": st.get('prompt', ''),
+                            "action": {
+                                "content": st.get('action', {}).get('content', '')
+                            },
+                            "observation": {
+                                "content": st.get('observation', {}).get('content', '')
+                            }
+                        }
+                        for st in split_turns
+                    ]
+                    first_changed_idx = min(first_changed_idx, i)
                     split_count += 1
                     continue
 
             if not v.get('is_correct', True):
                 corrected = v.get('corrected_turn') or {}
-                if corrected and 'action' in corrected and 'content' in corrected['action']:
-                    turns[i]['action']['content'] = corrected['action']['content']
-
-                if corrected and 'observation' in corrected and 'content' in corrected['observation']:
-                    new_output = corrected['observation']['content']
-                    turns[i]['observation']['content'] = new_output
+                corrected_action = corrected.get('action') or {}
+                corrected_observation = corrected.get('observation') or {}
+                if 'content' in corrected_action:
+                    turn['action']['content'] = corrected_action['content']
+                if 'content' in corrected_observation:
+                    turn['observation']['content'] = corrected_observation['content']
 
                 corrected_count += 1
             else:
@@ -680,31 +1002,18 @@ Rules:
         if missed_count > 0:
             print(f"  - Missed turns found in initial_output: {missed_count}")
 
-        for insert_idx, split_turns in sorted(turns_to_insert, reverse=True):
-            new_turns = []
-            for st in split_turns:
-                new_turn = {
-                    "turn_id": 0,
-                    "prompt": st.get('prompt', ''),
-                    "action": {
-                        "content": st.get('action', {}).get('content', '')
-                    },
-                    "observation": {
-                        "content": st.get('observation', {}).get('content', '')
-                    }
-                }
-                new_turns.append(new_turn)
-
-            turns[insert_idx:insert_idx+1] = new_turns
-
-        for i, turn in enumerate(turns, 1):
-            turn['turn_id'] = i
+        for i in range(first_changed_idx, len(turns)):
+            turns[i]['turn_id'] = i + 1
 
         print(f"[Step 4] Final result: {len(turns)} turns after processing")
 
         return verification_results
     
 async def parse_terminal_file(input_file, parsed_output=None, verified_output=None, model_name='gpt-5.2-2025-12-11', step4_model_name='claude-sonnet-4-20250514'):
+    async with shared_openai_client():
+        return await _parse_terminal_file(input_file, parsed_output, verified_output, model_name, step4_model_name)
+
+async def _parse_terminal_file(input_file, parsed_output, verified_output, model_name, step4_model_name):
     print(f"\n{'#'*60}")
     print(f"# Terminal File Parsing Started")
     print(f"# Input: {input_file}")
@@ -713,26 +1022,34 @@ async def parse_terminal_file(input_file, parsed_output=None, verified_output=No
     print(f"{'#'*60}")
 
     parser = TerminalParser(model_name=model_name, step4_model_name=step4_model_name)
+
+    lines, raw_text = parser._load(input_file)
     
-    success = await parser.step1_learn_prompts(input_file)
+    success = await parser.step1_learn_prompts(lines)
     if not success or len(parser.prompt_patterns) == 0:
         parser.prompt_patterns = [r'^[\$\#\%>]\s*']
+        parser._compile_patterns()
     
-    confirmed_line_nums = await parser.step2_filter_fake_prompts(input_file)
+    confirmed_line_nums = await parser.step2_filter_fake_prompts(lines)
     if not confirmed_line_nums:
-        with open(input_file, 'r', encoding='utf-8', errors='ignore') as f:
-            lines = f.readlines()
         confirmed_line_nums = set()
         for line_num, line in enumerate(lines, 1):
-            for pattern in parser.prompt_patterns:
-                try:
-                    if re.match(pattern, line.rstrip('\n')):
-                        confirmed_line_nums.add(line_num)
-                        break
-                except re.error:
-                    continue
+            match = parser._match_prompt(line)
+            if match:
+                confirmed_line_nums.add(line_num)
+                parser._prompt_match_ends[line_num] = match.end()
     
-    parsed_data = await parser.step3_parse_turns(input_file, confirmed_line_nums)
+    # step3/step4 的结果按 (模型, 文件内容, 输入) 整体缓存, 重复运行时直接复用
+    raw_digest = _digest(raw_text.encode('utf-8'))
+    step3_key = parser._cache_key('step3', STEP_CACHE_VERSION, model_name, raw_digest,
+                                  parser.prompt_patterns, sorted(confirmed_line_nums))
+    parsed_data = parser._cache_get(step3_key)
+    if _is_step_entry(parsed_data, 'initial_output', 'turns'):
+        print(f"\n[Step 3] Loaded {len(parsed_data['turns'])} turns from cache")
+    else:
+        parsed_data = await parser.step3_parse_turns(lines, confirmed_line_nums)
+        if not parser._step3_fell_back:
+            parser._cache_put(step3_key, parsed_data)
     
     parsed_result = {
         "file_path": input_file,
@@ -743,41 +1060,54 @@ async def parse_terminal_file(input_file, parsed_output=None, verified_output=No
         "confirmed_prompt_lines": sorted(list(confirmed_line_nums))
     }
     
+    # 写 parsed 结果放到线程中进行, 与 step4 的 LLM 请求重叠; 之后不再修改 parsed_result
+    write_task = None
     if parsed_output:
-        with open(parsed_output, 'w', encoding='utf-8') as f:
-            json.dump(parsed_result, f, ensure_ascii=False, indent=2)
-        print(f"\n[Output] Parsed result saved to: {parsed_output}")
-
-    verification_results = []
-    if len(parsed_data['turns']) > 0:
-        import copy
-        turns_for_verification = copy.deepcopy(parsed_data['turns'])
-        parsed_for_verification = {
-            "file_path": input_file,
-            "total_turns": len(turns_for_verification),
-            "initial_output": parsed_data["initial_output"],
-            "turns": turns_for_verification,
-            "learned_patterns": parser.prompt_patterns,
-            "confirmed_prompt_lines": sorted(list(confirmed_line_nums))
-        }
-        verification_results = await parser.step4_verify_turns(input_file, parsed_for_verification)
+        write_task = asyncio.create_task(asyncio.to_thread(_write_json, parsed_output, parsed_result))
+
+    # step4 或写 verified 结果出错时也要等待后台写入完成, 避免其异常丢失
+    try:
+        verification_results = []
+        if len(parsed_data['turns']) > 0:
+            # step4 只改写 turn_id 和 action/observation 的 content, 复制这两层即可
+            turns_for_verification = [
+                {**t, 'action': dict(t['action']), 'observation': dict(t['observation'])}
+                for t in parsed_data['turns']
+            ]
+            parsed_for_verification = {**parsed_result, "turns": turns_for_verification}
+            step4_key = parser._cache_key('step4', STEP_CACHE_VERSION, step4_model_name, raw_digest,
+                                          parsed_for_verification['initial_output'], turns_for_verification)
+            cached = parser._cache_get(step4_key)
+            if _is_step_entry(cached, 'initial_output', 'turns', 'verification_results'):
+                print(f"\n[Step 4] Loaded verification of {len(cached['turns'])} turns from cache")
+                turns_for_verification[:] = cached['turns']
+                parsed_for_verification['initial_output'] = cached['initial_output']
+                verification_results = cached['verification_results']
+            else:
+                verification_results = await parser.step4_verify_turns(raw_text, parsed_for_verification)
+                if not parser._step4_fell_back:
+                    parser._cache_put(step4_key, {
+                        "initial_output": parsed_for_verification['initial_output'],
+                        "turns": turns_for_verification,
+                        "verification_results": verification_results
+                    })
         
-        verified_result = {
-            "file_path": input_file,
-            "total_turns": len(turns_for_verification),
-            "initial_output": parsed_data["initial_output"],
-            "turns": turns_for_verification,
-            "learned_patterns": parser.prompt_patterns,
-            "confirmed_prompt_lines": sorted(list(confirmed_line_nums)),
-            "verification_results": verification_results
-        }
+            verified_result = {
+                **parsed_result,
+                "total_turns": len(turns_for_verification),
+                "turns": turns_for_verification,
+                "verification_results": verification_results
+            }
         
-        if verified_output:
-            with open(verified_output, 'w', encoding='utf-8') as f:
-                json.dump(verified_result, f, ensure_ascii=False, indent=2)
-            print(f"[Output] Verified result saved to: {verified_output}")
-    else:
-        verified_result = parsed_result
+            if verified_output:
+                _write_json(verified_output, verified_result)
+                print(f"[Output] Verified result saved to: {verified_output}")
+        else:
+            verified_result = parsed_result
+    finally:
+        if write_task is not None:
+            await write_task
+            print(f"\n[Output] Parsed result saved to: {parsed_output}")
 
     final_result = verified_result if len(parsed_data['turns']) > 0 else parsed_result
 
@@ -803,7 +1133,6 @@ async def one_model_parse_async(input_file, model_name='gpt-5.2-2025-12-11', ste
     return result
 
 if __name__ == "__main__":
-    import asyncio
     result = asyncio.run(parse_terminal_file(
         input_file='data/raw/txt/100024.txt',
         parsed_output='data/analyzed/100024_parsed_async.json',
@@ -21,10 +21,24 @@ def test_api_connection():
         base_url=base_url
     )
 
+    # 可选模型：gpt-4o, gpt-4o-mini, claude-3-5-sonnet-20241022, llama-3.2-3b-preview 等
+    model = os.getenv("OPENAI_MODEL", "gpt-4.1-mini-2025-04-14")
+
+    # 固定的系统提示词放在最前, 便于服务端复用前缀缓存; Claude 模型需显式标记缓存断点
+    system_content = "你是一个专业的AI助手，能够帮助用户解决各种问题。"
+    if model.startswith("claude"):
+        system_content = [
+            {
+                "type": "text",
+                "text": system_content,
+                "cache_control": {"type": "ephemeral"}
+            }
+        ]
+
     messages = [
         {
             "role": "system",
-            "content": "你是一个专业的AI助手，能够帮助用户解决各种问题。"
+            "content": system_content
         },
         {
             "role": "user",
@@ -32,9 +46,6 @@ def test_api_connection():
         }
     ]
 
-    # 可选模型：gpt-4o, gpt-4o-mini, claude-3-5-sonnet-20241022, llama-3.2-3b-preview 等
-    model = os.getenv("OPENAI_MODEL", "gpt-4.1-mini-2025-04-14")
-    
     response = client.chat.completions.create(
         messages=messages,
         model=model
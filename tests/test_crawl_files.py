@@ -14,19 +14,156 @@ import json
 import os
 import sys
 import argparse
+import functools
+import mmap
+import operator
 from pathlib import Path
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from itertools import compress
+
+from tqdm import tqdm
+
+# 优先使用 orjson 加速 JSON 解析/序列化，未安装时回退到标准库 json
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# 优先使用 ijson 流式解析, 内存占用只与单条记录相关
+try:
+    import ijson
+    IJSON_AVAILABLE = True
+except ImportError:
+    IJSON_AVAILABLE = False
+
+# 存在性检查 (faccessat); 跟随符号链接, 目标不存在的悬空链接视为缺失
+_exists = functools.partial(os.access, mode=os.F_OK)
+
+# 每个字段最多记录的缺失文件示例数
+MAX_MISSING_SAMPLES = 100
 
 # 添加项目根目录到 path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 
-def validate_data_files(input_file, base_dir=None, save_missing=False):
-    """验证数据文件中的路径引用"""
+def _exists_batch(paths):
+    """
+    检查一批路径是否存在。
     
-    # 读取 JSON 文件
-    with open(input_file, 'r', encoding='utf-8') as f:
-        data = json.load(f)
+    os.access(F_OK) 直接返回布尔值, 不构造 stat 结果也无需捕获异常, 可以整批 map;
+    与 Path.exists() 一致跟随符号链接, 指向不存在目标的链接判定为缺失。
+    """
+    return list(map(_exists, paths))
+
+
+def _list_dir(parent):
+    """列出目录项: {文件名: 是否为符号链接}, 目录不可读时返回 None"""
+    try:
+        with os.scandir(parent) as entries:
+            return {entry.name: entry.is_symlink() for entry in entries}
+    except OSError:
+        return None
+
+
+def default_workers():
+    """默认线程数: CPU 数的 8 倍, 最多 64"""
+    return min(64, (os.cpu_count() or 1) * 8)
+
+
+def check_paths_exist(paths, max_workers=None, batch_size=512):
+    """
+    使用线程池并发检查路径是否存在。
+    
+    paths 为 os.fsencode 编码后的 bytes 路径, 后续 stat/listdir 调用无需再逐次编码。
+    stat 调用期间会释放 GIL, 多个线程可以同时等待磁盘/网络文件系统。
+    重复路径只检查一次; 按父目录缓存目录是否存在, 父目录 (或其上一级目录)
+    不存在时其下文件直接判定为缺失, 不再逐个 stat;
+    同一目录下有多个候选文件时, 用一次 scandir 代替逐个 stat; 目录列表只能说明
+    普通目录项存在, 符号链接以及 "."/".." 等特殊文件名仍交给逐个检查。
+    剩余的逐个 stat 按 batch_size 分批提交给线程池, 每批在一个线程内连续完成,
+    起到类似 io_uring 批量提交的效果 (标准库没有 io_uring 接口, 不引入额外依赖)。
+    
+    Returns:
+        {路径: 是否存在}
+    """
+    if max_workers is None:
+        max_workers = default_workers()
+    if max_workers < 1 or batch_size < 1:
+        raise ValueError("max_workers 和 batch_size 必须为正整数")
+    
+    unique_paths = list(dict.fromkeys(paths))
+    exists_map = dict.fromkeys(unique_paths, False)
+    
+    # 按父目录分组, 每个路径只计算一次 dirname
+    by_parent = {}
+    dirname = os.path.dirname
+    for path in unique_paths:
+        by_parent.setdefault(dirname(path) or b'.', []).append(path)
+    
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # 目录存在性缓存: 先检查上一级目录, 分片目录较多时,
+        # 上一级目录缺失可一次性排除其下所有分片目录
+        grandparents = list(dict.fromkeys(dirname(parent) or b'.' for parent in by_parent))
+        dir_exists = dict(zip(grandparents, executor.map(os.path.isdir, grandparents)))
+        parents = [parent for parent in by_parent
+                   if parent not in dir_exists and dir_exists[dirname(parent) or b'.']]
+        dir_exists.update(zip(parents, executor.map(os.path.isdir, parents)))
+        by_parent = {parent: group for parent, group in by_parent.items()
+                     if dir_exists.get(parent, False)}
+        
+        # 每个目录只列出一次; 列表只在本次调用内使用, 再次验证时不会读到过期内容。
+        # scandir 通过 d_type 得知目录项是否为符号链接, 无需额外系统调用
+        shared_parents = [parent for parent, group in by_parent.items() if len(group) > 1]
+        listings = dict(zip(shared_parents, executor.map(_list_dir, shared_parents)))
+        
+        # 目录只有一个候选文件或无法列出时, 回退到逐个检查;
+        # 符号链接需确认目标存在, 特殊文件名不会出现在目录列表中, 同样逐个检查
+        candidates = []
+        basename = os.path.basename
+        for parent, group in by_parent.items():
+            entries = listings.get(parent)
+            if entries is None:
+                candidates.extend(group)
+                continue
+            for path in group:
+                name = basename(path)
+                is_symlink = entries.get(name)
+                if is_symlink or name in (b'', b'.', b'..'):
+                    candidates.append(path)
+                else:
+                    exists_map[path] = is_symlink is not None
+        
+        batches = [candidates[i:i + batch_size] for i in range(0, len(candidates), batch_size)]
+        for batch, results in zip(batches, executor.map(_exists_batch, batches)):
+            exists_map.update(zip(batch, results))
+    
+    return exists_map
+
+
+def iter_records(input_file):
+    """逐条产出 JSON 数组中的记录"""
+    if IJSON_AVAILABLE:
+        with open(input_file, 'rb') as f:
+            yield from ijson.items(f, 'item')
+        return
+    
+    if ORJSON_AVAILABLE:
+        # 内存映射文件后直接解析, 避免先把整个文件复制成一个 bytes 对象
+        with open(input_file, 'rb') as f, \
+                mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+                memoryview(mm) as view:
+            data = orjson.loads(view)
+    else:
+        with open(input_file, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    yield from data
+
+
+def validate_data_files(input_file, base_dir=None, save_missing=False, max_workers=None, batch_size=512):
+    """验证数据文件中的路径引用"""
     
     # 如果没有指定 base_dir，使用输入文件所在目录
     if base_dir is None:
@@ -35,40 +172,86 @@ def validate_data_files(input_file, base_dir=None, save_missing=False):
         base_dir = Path(base_dir)
     
     # 统计信息
-    total_records = len(data)
     path_fields = ['cast_path', 'gif_path', 'html_path', 'txt_path']
-    stats = {field: {'exists': 0, 'missing': 0, 'missing_files': []} for field in path_fields}
+    missing_files = [[] for _ in path_fields]
     
     print(f"输入文件: {input_file}")
     print(f"基准目录: {base_dir}")
-    print(f"开始验证 {total_records} 条记录...\n")
+    print(f"开始验证...\n")
     
-    # 验证每条记录
-    for i, item in enumerate(data, 1):
-        if i % 10000 == 0:
-            print(f"已处理 {i}/{total_records} 条记录...")
-        
-        for field in path_fields:
-            if field in item and item[field]:
+    # 第一遍: 流式读取记录, 把待检查的 (URL, 字段下标, 路径) 打包成平行列表
+    # 只保留 URL 而不是整条记录, 读完的记录可以立即释放
+    job_urls = []
+    job_fields = []
+    job_paths = []
+    # 热循环中用到的方法与常量提前绑定为局部变量, 省去每次的属性/全局查找
+    add_url = job_urls.append
+    add_field = job_fields.append
+    add_path = job_paths.append
+    fsencode = os.fsencode
+    join = os.path.join
+    # 热循环内只做字符串拼接, 不构造 Path 对象
+    base_str = os.fspath(base_dir)
+    field_slots = tuple(enumerate(path_fields))
+    total_records = 0
+    # 进度由 tqdm 按时间间隔刷新, 热循环内不做格式化和输出
+    records = tqdm(iter_records(input_file), desc="读取记录", unit="条", miniters=10000, mininterval=0.5)
+    for total_records, item in enumerate(records, 1):
+        for idx, field in field_slots:
+            # 一次 get 同时完成存在性和非空判断; 比先求 item.keys() 与字段集合的交集更快,
+            # 交集每条记录都要新建一个集合, 即使只含一个路径字段也不划算
+            file_path = item.get(field)
+            if file_path:
                 # 处理相对路径
-                file_path = item[field]
                 if file_path.startswith('./'):
-                    file_path = base_dir / file_path[2:]
+                    file_path = join(base_str, file_path[2:])
                 elif file_path.startswith('raw/'):
-                    file_path = base_dir / file_path
-                else:
-                    file_path = Path(file_path)
+                    file_path = join(base_str, file_path)
                 
-                if file_path.exists():
-                    stats[field]['exists'] += 1
-                else:
-                    stats[field]['missing'] += 1
-                    # 只记录前100个缺失的文件
-                    if len(stats[field]['missing_files']) < 100:
-                        stats[field]['missing_files'].append({
-                            'url': item.get('url', 'unknown'),
-                            'path': str(file_path)
-                        })
+                add_url(item.get('url', 'unknown'))
+                add_field(idx)
+                # 只编码一次, 后续系统调用直接使用 bytes 路径
+                add_path(fsencode(file_path))
+    print(f"共 {total_records} 条记录, {len(job_paths)} 个路径待检查")
+    sys.stdout.flush()
+    
+    # 并发检查路径是否存在
+    exists_map = check_paths_exist(job_paths, max_workers=max_workers, batch_size=batch_size)
+    
+    # 计数由 map/compress/Counter 在 C 层完成, 不逐条执行 Python 分支:
+    # 按字段统计路径总数和存在数, 缺失数由两者相减得到, 无需为每条路径构造元组
+    job_exists = list(map(exists_map.__getitem__, job_paths))
+    field_totals = Counter(job_fields)
+    field_exists = Counter(compress(job_fields, job_exists))
+    exists_counts = [field_exists[idx] for idx in range(len(path_fields))]
+    missing_counts = [field_totals[idx] - field_exists[idx] for idx in range(len(path_fields))]
+    
+    # 第二遍: 只遍历缺失项, 按原始顺序记录示例, 保证顺序稳定
+    # 每个字段只记录前100个缺失的文件; 记满后直接跳过, 全部记满后提前结束
+    missing_full = [False] * len(path_fields)
+    remaining = sum(min(count, MAX_MISSING_SAMPLES) for count in missing_counts)
+    for k in compress(range(len(job_paths)), map(operator.not_, job_exists)):
+        if not remaining:
+            break
+        idx = job_fields[k]
+        if missing_full[idx]:
+            continue
+        samples = missing_files[idx]
+        samples.append({
+            'url': job_urls[k],
+            'path': os.fsdecode(job_paths[k])
+        })
+        missing_full[idx] = len(samples) >= MAX_MISSING_SAMPLES
+        remaining -= 1
+    
+    stats = {
+        field: {
+            'exists': exists_counts[idx],
+            'missing': missing_counts[idx],
+            'missing_files': missing_files[idx]
+        }
+        for idx, field in enumerate(path_fields)
+    }
     
     # 打印结果
     print("\n" + "="*60)
@@ -108,16 +291,48 @@ def validate_data_files(input_file, base_dir=None, save_missing=False):
     print(f"  缺失: {total_missing}")
     print("="*60)
     
-    # 保存缺失文件列表
+    # 保存缺失文件列表: 汇总计数写入 missing_summary.json, 明细逐行写入 missing_files.ndjson
     if save_missing and total_missing > 0:
-        output_file = Path(input_file).parent / 'missing_files.json'
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(stats, f, ensure_ascii=False, indent=2)
-        print(f"\n缺失文件列表已保存到: {output_file}")
+        output_dir = Path(input_file).parent
+        summary_file = output_dir / 'missing_summary.json'
+        output_file = output_dir / 'missing_files.ndjson'
+        summary = {
+            field: {'exists': stats[field]['exists'], 'missing': stats[field]['missing']}
+            for field in path_fields
+        }
+        
+        if ORJSON_AVAILABLE:
+            with open(summary_file, 'wb') as f:
+                f.write(orjson.dumps(summary, option=orjson.OPT_INDENT_2))
+            with open(output_file, 'wb') as f:
+                for field in path_fields:
+                    for entry in stats[field]['missing_files']:
+                        f.write(orjson.dumps({'field': field, **entry}) + b'\n')
+        else:
+            with open(summary_file, 'w', encoding='utf-8') as f:
+                json.dump(summary, f, ensure_ascii=False, indent=2)
+            with open(output_file, 'w', encoding='utf-8') as f:
+                for field in path_fields:
+                    for entry in stats[field]['missing_files']:
+                        f.write(json.dumps({'field': field, **entry}, ensure_ascii=False) + '\n')
+        
+        print(f"\n缺失文件统计已保存到: {summary_file}")
+        print(f"缺失文件列表已保存到: {output_file}")
     
     return total_missing == 0
 
 
+def _positive_int(value):
+    """argparse 类型: 正整数"""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无效的整数: {value}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"必须为正整数: {value}")
+    return number
+
+
 def main():
     parser = argparse.ArgumentParser(description='验证数据文件中的路径引用')
     parser.add_argument('--input', '-i', type=str, default=None,
@@ -125,7 +340,11 @@ def main():
     parser.add_argument('--base-dir', '-b', type=str, default=None,
                         help='文件路径的基准目录 (默认: 输入文件所在目录)')
     parser.add_argument('--save-missing', '-s', action='store_true',
-                        help='保存缺失文件列表到 missing_files.json')
+                        help='保存缺失文件统计到 missing_summary.json, 明细到 missing_files.ndjson')
+    parser.add_argument('--workers', '-w', type=_positive_int, default=None,
+                        help='并发检查文件的线程数 (默认: min(64, CPU 数 x 8), 网络文件系统可调高)')
+    parser.add_argument('--batch-size', type=_positive_int, default=512,
+                        help='每个线程任务一次检查的路径数 (默认: 512)')
     
     args = parser.parse_args()
     
@@ -145,7 +364,9 @@ def main():
     success = validate_data_files(
         input_file,
         base_dir=args.base_dir,
-        save_missing=args.save_missing
+        save_missing=args.save_missing,
+        max_workers=args.workers,
+        batch_size=args.batch_size
     )
     
     sys.exit(0 if success else 1)